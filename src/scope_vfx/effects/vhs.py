@@ -1,5 +1,96 @@
 import torch
 
+from . import _numba_cpu
+
+# Frame-invariant constants, built once per shape/device instead of per call.
+_SCAN_WAVE_CACHE: dict[tuple, torch.Tensor] = {}
+_GRID_CACHE: dict[tuple, tuple[torch.Tensor, torch.Tensor]] = {}
+
+# Ring buffer of pre-generated grain frames.  VHS grain only needs to look
+# random, not be statistically fresh, so cycling through a small pool beats
+# paying for Philox RNG plus a full-tensor alloc every frame.  A pool of 16
+# keeps the repeat period long enough to be invisible at streaming rates.
+# The cursor is a device tensor advanced with an in-place add so the advance
+# is recorded by CUDA-graph capture and re-runs on every replay.  The pool
+# is shared, but each stream slot gets its own cursor — graphs replayed
+# concurrently on different streams must not race on one read-modify-write.
+_NOISE_POOL_SIZE = 16
+_NOISE_POOL_CACHE: dict[tuple, torch.Tensor] = {}
+_NOISE_CURSOR_CACHE: dict[tuple, torch.Tensor] = {}
+
+
+def _grain(
+    T: int, H: int, W: int, C: int,
+    dtype: torch.dtype, device: torch.device,
+    slot: int = 0,
+) -> torch.Tensor:
+    """Next (T, H, W, C) grain slab from the cycling noise pool."""
+    key = (H, W, C, dtype, device)
+    pool = _NOISE_POOL_CACHE.get(key)
+    if pool is None:
+        pool = torch.randn((_NOISE_POOL_SIZE, H, W, C), dtype=dtype, device=device)
+        _NOISE_POOL_CACHE[key] = pool
+    cursor = _NOISE_CURSOR_CACHE.get(key + (slot,))
+    if cursor is None:
+        # Stagger the start per slot so concurrent halves draw
+        # different slabs
+        start = slot * (_NOISE_POOL_SIZE // 2)
+        cursor = torch.full((), start, dtype=torch.int64, device=device)
+        _NOISE_CURSOR_CACHE[key + (slot,)] = cursor
+    idx = (torch.arange(T, device=device) + cursor) % _NOISE_POOL_SIZE
+    cursor.add_(T)
+    return pool.index_select(0, idx)
+
+
+def _scan_wave(H: int, scan_line_count: int, device: torch.device) -> torch.Tensor:
+    """Cached (H,) sine wave for the scan-line banding."""
+    key = (H, scan_line_count, device)
+    wave = _SCAN_WAVE_CACHE.get(key)
+    if wave is None:
+        rows = torch.arange(H, device=device, dtype=torch.float32)
+        wave = torch.sin(rows * (scan_line_count * 3.14159 / H))
+        _SCAN_WAVE_CACHE[key] = wave
+    return wave
+
+
+@torch.compile
+def _scan_noise(
+    frames: torch.Tensor,
+    mask: torch.Tensor | None,
+    grain: torch.Tensor | None,
+    noise_scale: float,
+) -> torch.Tensor:
+    """Scan-line multiply, grain add, and clamp fused into one memory pass.
+
+    Eagerly these are three separate elementwise ops, each streaming the
+    whole (T, H, W, C) tensor through memory; compiled they become a
+    single pass.
+    """
+    out = frames * mask if mask is not None else frames
+    if grain is not None:
+        out = out + grain * noise_scale
+    return out.clamp(0, 1)
+
+
+def _row_shift_base(
+    H: int, W: int, device: torch.device,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Cached base column indices plus the per-row tracking sine.
+
+    Only ``tracking`` (a scalar scale) varies between calls, so the column
+    arange and the row sine are cached; the caller scales the sine into a
+    pixel offset and adds it to the base indices.
+    """
+    key = (H, W, device)
+    cached = _GRID_CACHE.get(key)
+    if cached is None:
+        base = torch.arange(W, device=device, dtype=torch.float32)
+        rows_norm = torch.linspace(-1.0, 1.0, H, device=device)
+        row_sine = torch.sin(rows_norm * 6.2832 * 3.0)
+        cached = (base, row_sine)
+        _GRID_CACHE[key] = cached
+    return cached
+
 
 def vhs_retro(
     frames: torch.Tensor,
@@ -7,6 +98,7 @@ def vhs_retro(
     scan_line_count: int = 100,
     noise: float = 0.1,
     tracking: float = 0.2,
+    stream_slot: int = 0,
 ) -> torch.Tensor:
     """Apply a VHS / retro CRT look: scan lines, analog noise, and tracking distortion.
 
@@ -16,51 +108,69 @@ def vhs_retro(
         scan_line_count: Number of scan line pairs across the frame height.
         noise: Analog grain amount (0 = clean, 1 = heavy grain).
         tracking: Horizontal tracking distortion strength (0 = none, 1 = heavy).
+        stream_slot: Grain-cursor slot for callers running sub-batches
+            concurrently on separate CUDA streams.
 
     Returns:
         (T, H, W, C) tensor with the combined VHS effect applied.
     """
     _T, H, W, _C = frames.shape
-    result = frames.clone()
+    result = frames
 
-    # --- Scan lines ---
+    # --- Scan lines + analog noise (single fused pass) ---
+    mask1d = None
     if scan_line_intensity > 0 and scan_line_count > 0:
-        # Build a 1-D brightness mask that repeats `scan_line_count` times
-        rows = torch.arange(H, device=frames.device, dtype=torch.float32)
-        # sine wave creates smooth dark/light banding
-        wave = torch.sin(rows * (scan_line_count * 3.14159 / H))
-        # map [-1,1] -> [1-intensity, 1]  (dark bands at wave troughs)
-        mask = 1.0 - scan_line_intensity * 0.5 * (1.0 - wave)
-        result = result * mask.view(1, H, 1, 1)
+        # Cached 1-D sine wave creates smooth dark/light banding
+        wave = _scan_wave(H, scan_line_count, frames.device)
+        # map [-1,1] -> [1-intensity, 1]  (dark bands at wave troughs);
+        # match dtype so a float32 mask cannot promote fp16 frames
+        mask1d = (1.0 - scan_line_intensity * 0.5 * (1.0 - wave)).to(frames.dtype)
+
+    noise_scale = noise * 0.15
+    grain = None
+    if noise_scale > 0:
+        T, C = frames.shape[0], frames.shape[3]
+        grain = _grain(T, H, W, C, frames.dtype, frames.device, stream_slot)
 
-    # --- Analog noise / film grain ---
-    if noise > 0:
-        grain = torch.randn_like(result) * (noise * 0.15)
-        result = result + grain
+    if mask1d is not None or grain is not None:
+        if frames.device.type == "cpu" and _numba_cpu.HAS_NUMBA:
+            src = frames.contiguous()
+            result = torch.empty_like(src)
+            if mask1d is None:
+                mask1d = torch.ones(H, dtype=frames.dtype)
+            # with noise_scale == 0 the grain term vanishes, so any
+            # same-shaped array will do as a stand-in
+            grain_np = (grain if grain is not None else src).numpy()
+            _numba_cpu.vhs_scan_noise(
+                src.numpy(), mask1d.numpy(), grain_np, noise_scale, result.numpy(),
+            )
+        else:
+            mask = mask1d.view(1, H, 1, 1) if mask1d is not None else None
+            result = _scan_noise(frames, mask, grain, noise_scale)
 
     # --- Tracking distortion (horizontal sine-wave displacement) ---
     if tracking > 0:
         max_shift = tracking * 0.05  # fraction of image width
-        rows_norm = torch.linspace(-1.0, 1.0, H, device=frames.device)
-        # slowly varying sine gives the classic "wobbly VHS" look
-        offsets = max_shift * torch.sin(rows_norm * 6.2832 * 3.0)
-
-        # Build a sampling grid for grid_sample
-        grid_y = torch.linspace(-1.0, 1.0, H, device=frames.device)
-        grid_x = torch.linspace(-1.0, 1.0, W, device=frames.device)
-        gy, gx = torch.meshgrid(grid_y, grid_x, indexing="ij")
-
-        # Shift x-coordinates per row
-        gx = gx + offsets.view(H, 1)
+        base, row_sine = _row_shift_base(H, W, frames.device)
+        # slowly varying sine gives the classic "wobbly VHS" look;
+        # only horizontal 1D interpolation is needed, so a gather-and-lerp
+        # along the width axis replaces the general-purpose grid_sample.
+        offsets_px = (max_shift * row_sine) * ((W - 1) / 2)  # (H,)
 
-        grid = torch.stack([gx, gy], dim=-1)  # (H, W, 2)
-        grid = grid.unsqueeze(0).expand(result.shape[0], -1, -1, -1)  # (T, H, W, 2)
+        # Clamp the coordinate itself (not just the indices) so the lerp
+        # weight collapses to 0 at the left edge — matching grid_sample's
+        # border replicate instead of blending columns 0 and 1 there
+        src = (base.view(1, W) + offsets_px.view(H, 1)).clamp_(0, W - 1)
+        f = src.floor()
+        w = (src - f).to(result.dtype).view(1, H, W, 1)
+        lo = f.long()
+        hi = (lo + 1).clamp_(max=W - 1)
 
-        # grid_sample expects (N, C, H, W), so permute
-        result_nchw = result.permute(0, 3, 1, 2)
-        result_nchw = torch.nn.functional.grid_sample(
-            result_nchw, grid, mode="bilinear", padding_mode="border", align_corners=True
-        )
-        result = result_nchw.permute(0, 2, 3, 1)
+        T, C = result.shape[0], result.shape[3]
+        lo = lo.view(1, H, W, 1).expand(T, H, W, C)
+        hi = hi.view(1, H, W, 1).expand(T, H, W, C)
+        result = result.gather(2, lo) * (1.0 - w) + result.gather(2, hi) * w
 
-    return result.clamp(0, 1)
+    # _scan_noise already clamps, and the tracking lerp is a convex blend of
+    # in-range values, so no final clamp pass is needed.
+    return result
@@ -111,8 +111,10 @@ class VFXConfig(BasePipelineConfig):
         json_schema_extra=ui_field_config(order=23, label="Ink Strength"),
     )
 
+    # Default compensates for the L1 (|gx|+|gy|) edge metric, which reads
+    # roughly sqrt(2) higher than the old L2 magnitude
     warhol_edge_thresh: float = Field(
-        default=0.15,
+        default=0.21,
         ge=0.0,
         le=1.0,
         description="Edge detection threshold (higher = fewer, bolder edges)",